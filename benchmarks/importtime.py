@@ -0,0 +1,84 @@
+"""Import-time regression check for the moonshot package.
+
+Runs ``python -X importtime`` in a fresh interpreter for each lightweight
+module and fails if it drags in a heavy dependency or if the median of
+``--repeat`` runs exceeds the module's budget. Budgets are about twice the
+medians measured on a clean tree, well under the ~450 ms anchorpy alone
+costs; scale them with ``--budget-scale`` on slower machines.
+
+    python benchmarks/importtime.py [--repeat 7] [--budget-scale 1.0]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# modules that must stay usable without anchorpy or the solana RPC client,
+# with their import budgets in milliseconds
+LIGHT_MODULES = {
+    "moonshot.constants": 300,
+    "moonshot.types": 300,
+    "moonshot.curve": 300,
+    "moonshot.keypair": 100,
+    "moonshot.instrumentation": 20,
+    "moonshot.token_launchpad": 300,
+}
+
+# dependencies that should only load when a TokenLaunchpad is constructed
+HEAVY_MODULES = [
+    "anchorpy",
+    "solana.rpc.async_api",
+    "spl.token.instructions",
+]
+
+
+def measure(module: str) -> Tuple[int, Dict[str, int]]:
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+
+    cumulative = {}
+    for line in out.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|")
+        if not cum.strip().isdigit():
+            continue
+        cumulative[name.strip()] = int(cum)
+    return cumulative.get(module, 0), cumulative
+
+
+def measure_median(module: str, repeat: int) -> Tuple[float, Dict[str, int]]:
+    runs = [measure(module) for _ in range(repeat)]
+    return statistics.median(total_us for total_us, _ in runs), runs[0][1]
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--budget-scale", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module, budget_ms in LIGHT_MODULES.items():
+        budget_ms *= args.budget_scale
+        total_us, imported = measure_median(module, args.repeat)
+        heavy = [name for name in HEAVY_MODULES if name in imported]
+        status = "ok"
+        if heavy:
+            status = "imports " + ", ".join(heavy)
+            failed = True
+        elif total_us / 1000 > budget_ms:
+            status = "over budget"
+            failed = True
+        print(f"{module:<28} {total_us / 1000:8.1f} ms  (budget {budget_ms:.0f} ms)  {status}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
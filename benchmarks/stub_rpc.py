@@ -0,0 +1,205 @@
+"""In-process stub Solana JSON-RPC server for offline load testing.
+
+Serves the three calls the trade path makes (getAccountInfo,
+getLatestBlockhash, sendTransaction) from memory, with an optional fixed
+latency per request, so TokenLaunchpad can be driven end to end without a
+network.
+
+    with StubRpcServer(latency=0.005) as stub:
+        stub.add_account(curve_account_pubkey, encode_curve_account(...))
+        connection = AsyncClient(stub.url)
+"""
+import base64
+import hashlib
+import json
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Union
+
+from anchorpy.coder.accounts import AccountsCoder
+from anchorpy.program.common import NamedInstruction
+from construct import Container
+from solders.hash import Hash
+from solders.pubkey import Pubkey
+from solders.transaction import VersionedTransaction
+
+from moonshot.constants import MOONSHOT_PROGRAM_ID
+from moonshot.token_launchpad import load_idl
+from moonshot.types import Currency, CurveType, MigrationTarget
+
+
+@lru_cache(maxsize=None)
+def accounts_coder() -> AccountsCoder:
+    return AccountsCoder(load_idl())
+
+
+def encode_curve_account(
+    mint: Pubkey,
+    curve_type: str = "ConstantProductV1",
+    total_supply: int = 10**18,
+    curve_amount: int = 10**18,
+    decimals: int = 9,
+    marketcap_threshold: int = 345_000_000_000,
+    migration_fee: int = 0,
+    coef_b: int = 25,
+    bump: int = 255,
+) -> bytes:
+    # encoded with the IDL's own layout, with Sol collateral and Raydium as
+    # the migration target
+    data = Container(
+        total_supply=total_supply,
+        curve_amount=curve_amount,
+        mint=mint,
+        decimals=decimals,
+        collateral_currency=Currency.Sol(),
+        curve_type=getattr(CurveType, curve_type)(),
+        marketcap_threshold=marketcap_threshold,
+        marketcap_currency=Currency.Sol(),
+        migration_fee=migration_fee,
+        coef_b=coef_b,
+        bump=bump,
+        migration_target=MigrationTarget.Raydium(),
+    )
+    return accounts_coder().build(NamedInstruction(data=data, name="CurveAccount"))
+
+
+def load_accounts(path: str) -> Dict[str, bytes]:
+    # {pubkey: base64 account data}, as written by record_accounts
+    with open(path, "r") as file:
+        return {pubkey: base64.b64decode(data) for pubkey, data in json.load(file).items()}
+
+
+async def record_accounts(connection, pubkeys, path: str):
+    # snapshot live account data from a real RPC for later offline replay
+    recorded = {}
+    for pubkey in pubkeys:
+        resp = await connection.get_account_info(pubkey, encoding="base64")
+        if resp.value is not None:
+            recorded[str(pubkey)] = base64.b64encode(resp.value.data).decode()
+    with open(path, "w") as file:
+        json.dump(recorded, file, indent=2)
+
+
+class StubRpcServer:
+    def __init__(
+        self,
+        accounts: Optional[Dict[str, bytes]] = None,
+        latency: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        slot: int = 1,
+        blockhash: Optional[Hash] = None,
+    ):
+        self.accounts: Dict[str, bytes] = dict(accounts or {})
+        self.latency = latency
+        self.slot = slot
+        self.blockhash = blockhash or Hash(hashlib.sha256(b"moonshot-stub").digest())
+        self.request_counts: Dict[str, int] = {}
+        self.sent_transactions = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add_account(self, pubkey: Union[Pubkey, str], data: bytes):
+        self.accounts[str(pubkey)] = data
+
+    def start(self) -> "StubRpcServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StubRpcServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def handle(self, request: Dict) -> Dict:
+        method = request.get("method")
+        params = request.get("params") or []
+        with self._lock:
+            self.request_counts[method] = self.request_counts.get(method, 0) + 1
+
+        if method == "getAccountInfo":
+            result = self.get_account_info(params[0])
+        elif method == "getLatestBlockhash":
+            result = {
+                "context": {"slot": self.slot},
+                "value": {"blockhash": str(self.blockhash), "lastValidBlockHeight": self.slot + 150},
+            }
+        elif method == "sendTransaction":
+            result = self.send_transaction(params[0])
+        else:
+            return {
+                "jsonrpc": "2.0",
+                "error": {"code": -32601, "message": f"Method not found: {method}"},
+                "id": request.get("id"),
+            }
+        return {"jsonrpc": "2.0", "result": result, "id": request.get("id")}
+
+    def get_account_info(self, pubkey: str) -> Dict:
+        data = self.accounts.get(pubkey)
+        if data is None:
+            return {"context": {"slot": self.slot}, "value": None}
+        return {
+            "context": {"slot": self.slot},
+            "value": {
+                "data": [base64.b64encode(data).decode(), "base64"],
+                "executable": False,
+                "lamports": 1_000_000_000,
+                "owner": str(MOONSHOT_PROGRAM_ID),
+                "rentEpoch": 0,
+                "space": len(data),
+            },
+        }
+
+    def send_transaction(self, encoded_tx: str) -> str:
+        tx = VersionedTransaction.from_bytes(base64.b64decode(encoded_tx))
+        with self._lock:
+            self.sent_transactions += 1
+        return str(tx.signatures[0])
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body go out as separate writes on a keep-alive
+            # connection; without TCP_NODELAY, Nagle and delayed ACK add ~40 ms
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length))
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if isinstance(request, list):
+                    response = [stub.handle(r) for r in request]
+                else:
+                    response = stub.handle(request)
+                body = json.dumps(response).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,181 @@
+"""Offline throughput benchmarks for the moonshot trade path.
+
+Covers curve quotes for both curve types, buy/sell instruction building,
+transaction compile + sign, and end-to-end trades per second against the
+in-process StubRpcServer. Keys and accounts are fixed, so runs are
+reproducible across machines.
+
+The end-to-end run uses a synthesised curve account unless --accounts
+points at a file written by stub_rpc.record_accounts, in which case the
+recorded curve for --mint is replayed.
+
+    python benchmarks/trade_path.py [--iterations 2000] [--trades 500]
+                                    [--latency-ms 0] [--concurrency 16]
+                                    [--accounts PATH] [--mint PUBKEY]
+"""
+import argparse
+import asyncio
+import json
+from time import perf_counter
+from typing import Callable, Awaitable
+
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+from solders.message import MessageV0
+from solders.transaction import VersionedTransaction
+from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
+from anchorpy import Wallet
+from solana.rpc.async_api import AsyncClient
+
+from moonshot.token_launchpad import TokenLaunchpad
+from moonshot.curve import ConstantProductCurveV1, LinearCurveV1
+from moonshot.constants import TOKEN_PRECISION
+from moonshot.instrumentation import HistogramInstrumentation
+from moonshot.types import is_variant, CurveAccount, CurveType, Currency, MigrationTarget, TradeType, FixedSide
+
+from stub_rpc import StubRpcServer, encode_curve_account, load_accounts
+
+TOKEN_MINT = Pubkey.from_string("C1SHmyVLzhWRbXCh2zGYV9n5Wmn8suVGUTt3xedL6Etb")
+KEYPAIR = Keypair.from_seed(bytes(range(32)))
+# a quarter of the supply already sold, so quotes are mid-curve
+CURVE_AMOUNT = 10**18 * 3 // 4
+
+
+def make_curve_account(curve_type) -> CurveAccount:
+    return CurveAccount(
+        total_supply=10**18,
+        curve_amount=CURVE_AMOUNT,
+        mint=TOKEN_MINT,
+        decimals=9,
+        collateral_currency=Currency.Sol(),
+        curve_type=curve_type,
+        marketcap_threshold=345_000_000_000,
+        marketcap_currency=Currency.Sol(),
+        migration_fee=0,
+        coef_b=25,
+        bump=255,
+        migration_target=MigrationTarget.Raydium(),
+    )
+
+
+def report(name: str, count: int, elapsed: float):
+    print(f"{name:<56} {count / elapsed:12,.0f} ops/s {elapsed / count * 1e6:10.1f} us/op")
+
+
+def bench(name: str, fn: Callable[[], object], iterations: int):
+    fn()
+    start = perf_counter()
+    for _ in range(iterations):
+        fn()
+    report(name, iterations, perf_counter() - start)
+
+
+async def bench_async(name: str, fn: Callable[[], Awaitable[object]], iterations: int):
+    await fn()
+    start = perf_counter()
+    for _ in range(iterations):
+        await fn()
+    report(name, iterations, perf_counter() - start)
+
+
+def bench_quotes(iterations: int):
+    amount = int(0.1 * TOKEN_PRECISION)
+    token_amount = 10**15
+    for curve, curve_type in (
+        (ConstantProductCurveV1(), CurveType.ConstantProductV1()),
+        (LinearCurveV1(), CurveType.LinearV1()),
+    ):
+        curve_account = make_curve_account(curve_type)
+        label = type(curve).__name__
+        for direction in (TradeType.Buy(), TradeType.Sell()):
+            side = "buy" if is_variant(direction, "Buy") else "sell"
+            bench(
+                f"quote {label} {side} tokens_from_collateral",
+                lambda: curve.get_tokens_amount_from_collateral(amount, curve_account, direction),
+                iterations,
+            )
+            bench(
+                f"quote {label} {side} collateral_from_tokens",
+                lambda: curve.get_collateral_amount_from_tokens(token_amount, curve_account, direction),
+                iterations,
+            )
+
+
+async def bench_instructions(launchpad: TokenLaunchpad, iterations: int):
+    amount = int(0.1 * TOKEN_PRECISION)
+    curve_account = make_curve_account(CurveType.ConstantProductV1())
+    await bench_async(
+        "build get_buy_ix ExactIn",
+        lambda: launchpad.get_buy_ix(amount, FixedSide.ExactIn(), curve_account=curve_account),
+        iterations,
+    )
+    await bench_async(
+        "build get_sell_ix ExactOut",
+        lambda: launchpad.get_sell_ix(amount, FixedSide.ExactOut(), curve_account=curve_account),
+        iterations,
+    )
+    return await launchpad.get_buy_ix(amount, curve_account=curve_account)
+
+
+def bench_compile_sign(launchpad: TokenLaunchpad, ix, blockhash, iterations: int):
+    ixs = [set_compute_unit_limit(100_000), set_compute_unit_price(20_000), ix]
+    msg = MessageV0.try_compile(launchpad.authority, ixs, [], blockhash)
+
+    bench("compile MessageV0.try_compile", lambda: MessageV0.try_compile(launchpad.authority, ixs, [], blockhash), iterations)
+    bench("sign VersionedTransaction", lambda: bytes(VersionedTransaction(msg, [KEYPAIR])), iterations)
+
+
+async def bench_end_to_end(launchpad: TokenLaunchpad, trades: int, concurrency: int):
+    label = f"end-to-end buy (concurrency={concurrency})"
+    amount = int(0.1 * TOKEN_PRECISION)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def trade():
+        async with semaphore:
+            ix = await launchpad.get_buy_ix(amount, slippage_bps=500)
+            await launchpad.send_ix(ix)
+
+    await trade()
+    start = perf_counter()
+    await asyncio.gather(*(trade() for _ in range(trades)))
+    report(label, trades, perf_counter() - start)
+
+
+async def main(args):
+    bench_quotes(args.iterations)
+
+    accounts = load_accounts(args.accounts) if args.accounts else None
+    token_mint = Pubkey.from_string(args.mint)
+
+    with StubRpcServer(accounts, latency=args.latency_ms / 1000) as stub:
+        launchpad = TokenLaunchpad(AsyncClient(stub.url), Wallet(KEYPAIR), token_mint)
+        if accounts is None:
+            stub.add_account(
+                launchpad.curve_account_pubkey,
+                encode_curve_account(token_mint, curve_amount=CURVE_AMOUNT),
+            )
+        elif str(launchpad.curve_account_pubkey) not in accounts:
+            raise SystemExit(f"{args.accounts} has no curve account for mint {token_mint}")
+
+        ix = await bench_instructions(launchpad, args.iterations)
+        bench_compile_sign(launchpad, ix, stub.blockhash, args.iterations)
+
+        instrumentation = HistogramInstrumentation()
+        launchpad.instrumentation = instrumentation
+        await bench_end_to_end(launchpad, args.trades, args.concurrency)
+        await launchpad.connection.close()
+
+    if args.snapshot:
+        print(json.dumps(instrumentation.snapshot(), indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--trades", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--accounts", help="JSON file of recorded accounts to replay, from stub_rpc.record_accounts")
+    parser.add_argument("--mint", default=str(TOKEN_MINT), help="token mint to trade in the end-to-end run")
+    parser.add_argument("--snapshot", action="store_true", help="print per-stage timings of the end-to-end run")
+    asyncio.run(main(parser.parse_args()))
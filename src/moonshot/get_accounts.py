@@ -1,10 +1,14 @@
-from typing import cast, Optional, Callable
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, cast, Optional, Callable
 from solders.pubkey import Pubkey
-from anchorpy import Program, ProgramAccount
 from solana.rpc.commitment import Commitment, Processed, Confirmed
 
 from moonshot.types import *
 
+if TYPE_CHECKING:
+    from anchorpy import Program
+
 
 async def get_account_data_and_slot(
     address: Pubkey,
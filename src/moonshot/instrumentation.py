@@ -0,0 +1,175 @@
+import threading
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from time import perf_counter_ns
+from typing import Dict, List, Optional
+
+# stage names recorded by TokenLaunchpad, in trade-path order
+FETCH = "fetch"
+QUOTE = "quote"
+BUILD = "build"
+BLOCKHASH = "blockhash"
+COMPILE = "compile"
+SIGN = "sign"
+SEND = "send"
+
+STAGES = (FETCH, QUOTE, BUILD, BLOCKHASH, COMPILE, SIGN, SEND)
+
+_NULL_SPAN = nullcontext()
+
+
+class Instrumentation(ABC):
+    @abstractmethod
+    def record_duration(self, stage: str, duration_ns: int):
+        pass
+
+    @abstractmethod
+    def record_rpc(self, method: str):
+        pass
+
+    @abstractmethod
+    def record_tx_bytes(self, size: int):
+        pass
+
+    @abstractmethod
+    def snapshot(self) -> Dict:
+        pass
+
+    def span(self, stage: str):
+        return _Span(self, stage)
+
+
+class _Span:
+    __slots__ = ("instrumentation", "stage", "start")
+
+    def __init__(self, instrumentation: Instrumentation, stage: str):
+        self.instrumentation = instrumentation
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.instrumentation.record_duration(self.stage, perf_counter_ns() - self.start)
+        return False
+
+
+class NoopInstrumentation(Instrumentation):
+    def record_duration(self, stage: str, duration_ns: int):
+        pass
+
+    def record_rpc(self, method: str):
+        pass
+
+    def record_tx_bytes(self, size: int):
+        pass
+
+    def snapshot(self) -> Dict:
+        return {}
+
+    def span(self, stage: str):
+        return _NULL_SPAN
+
+
+# each power of two is split into 2**SUB_BUCKET_BITS linear steps, so a
+# bucket's upper bound is at most 12.5% above any value it holds
+SUB_BUCKET_BITS = 3
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+
+def bucket_index(value: int) -> int:
+    if value < SUB_BUCKETS:
+        return max(value, 0)
+    shift = value.bit_length() - 1 - SUB_BUCKET_BITS
+    return SUB_BUCKETS * (shift + 1) + (value >> shift) - SUB_BUCKETS
+
+
+def bucket_upper_bound(index: int) -> int:
+    if index < SUB_BUCKETS:
+        return index
+    shift = index // SUB_BUCKETS - 1
+    return ((index % SUB_BUCKETS + SUB_BUCKETS + 1) << shift) - 1
+
+
+class Histogram:
+    # covers values up to 2**64; larger ones land in the last bucket
+    def __init__(self, num_buckets: int = SUB_BUCKETS * 62):
+        self.buckets: List[int] = [0] * num_buckets
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def add(self, value: int):
+        index = min(bucket_index(value), len(self.buckets) - 1)
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> Optional[int]:
+        # upper bound of the bucket holding the q-th value, clamped to [min, max]
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if bucket and seen >= rank:
+                return max(min(bucket_upper_bound(index), self.max), self.min)
+        return self.max
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+        }
+
+
+class HistogramInstrumentation(Instrumentation):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.durations: Dict[str, Histogram] = {}
+            self.rpc_counts: Dict[str, int] = {}
+            self.tx_bytes = Histogram()
+
+    def record_duration(self, stage: str, duration_ns: int):
+        with self._lock:
+            histogram = self.durations.get(stage)
+            if histogram is None:
+                histogram = self.durations[stage] = Histogram()
+            histogram.add(duration_ns)
+
+    def record_rpc(self, method: str):
+        with self._lock:
+            self.rpc_counts[method] = self.rpc_counts.get(method, 0) + 1
+
+    def record_tx_bytes(self, size: int):
+        with self._lock:
+            self.tx_bytes.add(size)
+
+    def snapshot(self) -> Dict:
+        # durations are in nanoseconds, tx_bytes in bytes
+        with self._lock:
+            return {
+                "durations_ns": {stage: h.to_dict() for stage, h in self.durations.items()},
+                "rpc_counts": dict(self.rpc_counts),
+                "tx_bytes": self.tx_bytes.to_dict(),
+            }
+
+
+DEFAULT_INSTRUMENTATION = NoopInstrumentation()
@@ -1,30 +1,52 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Iterable, Union
 from solders.pubkey import Pubkey
 from solders.transaction import VersionedTransaction
 from solders.instruction import Instruction
 from solders.message import MessageV0
 from solders.hash import Hash
 from solders.signature import Signature
+from solders.system_program import ID as SYS_PROGRAM_ID
+from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
 from solders.rpc.responses import SendTransactionResp
-from solana.rpc.async_api import AsyncClient
 from solana.rpc.types import TxOpts
 from solana.rpc.commitment import Processed, Confirmed
-from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
-from spl.token.constants import TOKEN_PROGRAM_ID, ASSOCIATED_TOKEN_PROGRAM_ID
-from solders.system_program import ID as SYS_PROGRAM_ID
-from spl.token.instructions import get_associated_token_address
-from anchorpy import Program, Context, Idl, Provider, Wallet
-from pathlib import Path
-from typing import Optional, Iterable, Union
 
-import moonshot
-from moonshot.constants import MOONSHOT_PROGRAM_ID, HELIO_FEE_ID, DEX_FEE_ID, CONFIG_ACCOUNT_ID
+from moonshot.constants import (
+    MOONSHOT_PROGRAM_ID, HELIO_FEE_ID, DEX_FEE_ID, CONFIG_ACCOUNT_ID,
+    TOKEN_PROGRAM_ID, ASSOCIATED_TOKEN_PROGRAM_ID, get_associated_token_address,
+)
 from moonshot.types import is_variant, CurveAccount, TradeType, FixedSide, TradeParams
 from moonshot.curve import AbstractCurve, ConstantProductCurveV1, LinearCurveV1
 from moonshot.get_accounts import get_curve_account
+from moonshot.instrumentation import (
+    Instrumentation, DEFAULT_INSTRUMENTATION,
+    FETCH, QUOTE, BUILD, BLOCKHASH, COMPILE, SIGN, SEND,
+)
+
+# anchorpy and the async RPC client are slow to import, so they are only
+# pulled in when a TokenLaunchpad is actually used.
+if TYPE_CHECKING:
+    from anchorpy import Program, Idl, Wallet
+    from solana.rpc.async_api import AsyncClient
+
+IDL_PATH = Path(__file__).parent / "moonshot.json"
 
 DEFAULT_TX_OPTIONS = TxOpts(skip_confirmation=False, skip_preflight=False, preflight_commitment=Processed)
 DEFAULT_FIXED_SIDE = FixedSide.ExactIn()
 
+
+# the IDL is parsed once per process and shared by every TokenLaunchpad
+@lru_cache(maxsize=None)
+def load_idl() -> Idl:
+    from anchorpy import Idl
+
+    return Idl.from_json(IDL_PATH.read_text())
+
+
 class TokenLaunchpad:
     def __init__(
         self, 
@@ -32,24 +54,29 @@ class TokenLaunchpad:
         wallet : Wallet, 
         token_mint : Pubkey,
         opts: TxOpts = DEFAULT_TX_OPTIONS,
+        program: Optional[Program] = None,
+        instrumentation: Optional[Instrumentation] = None,
     ):
         self.connection = connection
         self.wallet = wallet
         self.authority = wallet.public_key
         self.token_mint = token_mint
         self.opts = opts
+        self.instrumentation = instrumentation if instrumentation is not None else DEFAULT_INSTRUMENTATION
 
-        file = Path(str(moonshot.__path__[0]) + "/moonshot.json")
-        raw = file.read_text()
-        idl = Idl.from_json(raw)
-
-        provider = Provider(connection, wallet, opts)
+        # building a Program constructs the whole coder; pass an existing one
+        # to share it between launchpads for different mints
         self.program_id = MOONSHOT_PROGRAM_ID
-        self.program = Program(
-            idl,
-            self.program_id,
-            provider,
-        )
+        if program is None:
+            from anchorpy import Program, Provider
+
+            provider = Provider(connection, wallet, opts)
+            program = Program(
+                load_idl(),
+                self.program_id,
+                provider,
+            )
+        self.program = program
 
         self.curve_account_pubkey = Pubkey.find_program_address(
             [b"token", bytes(token_mint)],
@@ -70,7 +97,8 @@ class TokenLaunchpad:
             curve_account = await self.get_curve_account()
         if self.curve is None:
             self.curve = self.get_curve(curve_account)
-        return self.curve.get_tokens_amount_from_collateral(amount, curve_account, trade_direction)
+        with self.instrumentation.span(QUOTE):
+            return self.curve.get_tokens_amount_from_collateral(amount, curve_account, trade_direction)
 
     async def get_collateral_amount_by_tokens(
         self,
@@ -82,10 +110,13 @@ class TokenLaunchpad:
             curve_account = await self.get_curve_account()
         if self.curve is None:
             self.curve = self.get_curve(curve_account)
-        return self.curve.get_collateral_amount_from_tokens(amount, curve_account, trade_direction)
+        with self.instrumentation.span(QUOTE):
+            return self.curve.get_collateral_amount_from_tokens(amount, curve_account, trade_direction)
 
     async def get_curve_account(self) -> CurveAccount:
-        return await get_curve_account(self.program, self.curve_account_pubkey)
+        self.instrumentation.record_rpc("getAccountInfo")
+        with self.instrumentation.span(FETCH):
+            return await get_curve_account(self.program, self.curve_account_pubkey)
     
     def get_curve(self, curve_account: CurveAccount) -> AbstractCurve:
         if is_variant(curve_account.curve_type, "ConstantProductV1"):
@@ -119,24 +150,27 @@ class TokenLaunchpad:
             slippage_bps=slippage_bps
         )
 
-        ix = self.program.instruction["buy"](
-            trade_params,
-            ctx=Context(
-                accounts={
-                    "sender": self.authority,
-                    "sender_token_account": self.token_account_pubkey,
-                    "curve_account": self.curve_account_pubkey,
-                    "curve_token_account": self.curve_token_account_pubkey,
-                    "dex_fee": DEX_FEE_ID,
-                    "helio_fee": HELIO_FEE_ID,
-                    "mint": self.token_mint,
-                    "config_account": CONFIG_ACCOUNT_ID,
-                    "token_program": TOKEN_PROGRAM_ID,
-                    "associated_token_program": ASSOCIATED_TOKEN_PROGRAM_ID,
-                    "system_program": SYS_PROGRAM_ID,
-                },
-            ),
-        )
+        from anchorpy import Context
+
+        with self.instrumentation.span(BUILD):
+            ix = self.program.instruction["buy"](
+                trade_params,
+                ctx=Context(
+                    accounts={
+                        "sender": self.authority,
+                        "sender_token_account": self.token_account_pubkey,
+                        "curve_account": self.curve_account_pubkey,
+                        "curve_token_account": self.curve_token_account_pubkey,
+                        "dex_fee": DEX_FEE_ID,
+                        "helio_fee": HELIO_FEE_ID,
+                        "mint": self.token_mint,
+                        "config_account": CONFIG_ACCOUNT_ID,
+                        "token_program": TOKEN_PROGRAM_ID,
+                        "associated_token_program": ASSOCIATED_TOKEN_PROGRAM_ID,
+                        "system_program": SYS_PROGRAM_ID,
+                    },
+                ),
+            )
         return ix
 
     async def get_sell_ix(
@@ -163,37 +197,44 @@ class TokenLaunchpad:
             slippage_bps=slippage_bps
         )
 
-        ix = self.program.instruction["sell"](
-            trade_params,
-            ctx=Context(
-                accounts={
-                    "sender": self.authority,
-                    "sender_token_account": self.token_account_pubkey,
-                    "curve_account": self.curve_account_pubkey,
-                    "curve_token_account": self.curve_token_account_pubkey,
-                    "dex_fee": DEX_FEE_ID,
-                    "helio_fee": HELIO_FEE_ID,
-                    "mint": self.token_mint,
-                    "config_account": CONFIG_ACCOUNT_ID,
-                    "token_program": TOKEN_PROGRAM_ID,
-                    "associated_token_program": ASSOCIATED_TOKEN_PROGRAM_ID,
-                    "system_program": SYS_PROGRAM_ID,
-                },
-            ),
-        )
+        from anchorpy import Context
+
+        with self.instrumentation.span(BUILD):
+            ix = self.program.instruction["sell"](
+                trade_params,
+                ctx=Context(
+                    accounts={
+                        "sender": self.authority,
+                        "sender_token_account": self.token_account_pubkey,
+                        "curve_account": self.curve_account_pubkey,
+                        "curve_token_account": self.curve_token_account_pubkey,
+                        "dex_fee": DEX_FEE_ID,
+                        "helio_fee": HELIO_FEE_ID,
+                        "mint": self.token_mint,
+                        "config_account": CONFIG_ACCOUNT_ID,
+                        "token_program": TOKEN_PROGRAM_ID,
+                        "associated_token_program": ASSOCIATED_TOKEN_PROGRAM_ID,
+                        "system_program": SYS_PROGRAM_ID,
+                    },
+                ),
+            )
         return ix
 
     async def fetch_latest_blockhash(self) -> Hash:
-        return (
-            await self.connection.get_latest_blockhash(Confirmed)
-        ).value.blockhash
+        self.instrumentation.record_rpc("getLatestBlockhash")
+        with self.instrumentation.span(BLOCKHASH):
+            return (
+                await self.connection.get_latest_blockhash(Confirmed)
+            ).value.blockhash
 
-    async def send_ix(
+    def build_transaction(
         self,
         ix : Union[Instruction, Iterable[Instruction]],
+        latest_blockhash: Hash,
         compute_unit_price: int = 20_000,
         compute_unit_limit: int = 100_000,
-    ) -> Signature:
+    ) -> bytes:
+        # pure compile + sign, safe to run off the event loop
         compute_price_ix = set_compute_unit_price(compute_unit_price)
         compute_limit_ix = set_compute_unit_limit(compute_unit_limit)
         if isinstance(ix, Instruction):
@@ -201,18 +242,29 @@ class TokenLaunchpad:
         else:
             ixs = [compute_limit_ix, compute_price_ix] + list(ix)
 
-        latest_blockhash = await self.fetch_latest_blockhash()
-        msg = MessageV0.try_compile(
-            self.authority, ixs, [], latest_blockhash
-        )
-        tx = VersionedTransaction(msg, [self.wallet.payer])
-        body = self.connection._send_raw_transaction_body(bytes(tx), self.opts)
-        resp = await self.connection._provider.make_request(body, SendTransactionResp)
-        return resp.value
-
-
-
-
-
+        with self.instrumentation.span(COMPILE):
+            msg = MessageV0.try_compile(
+                self.authority, ixs, [], latest_blockhash
+            )
+        with self.instrumentation.span(SIGN):
+            tx = VersionedTransaction(msg, [self.wallet.payer])
+            raw_tx = bytes(tx)
+        self.instrumentation.record_tx_bytes(len(raw_tx))
+        return raw_tx
 
+    async def send_raw_transaction(self, raw_tx: bytes) -> Signature:
+        self.instrumentation.record_rpc("sendTransaction")
+        with self.instrumentation.span(SEND):
+            body = self.connection._send_raw_transaction_body(raw_tx, self.opts)
+            resp = await self.connection._provider.make_request(body, SendTransactionResp)
+        return resp.value
 
+    async def send_ix(
+        self,
+        ix : Union[Instruction, Iterable[Instruction]],
+        compute_unit_price: int = 20_000,
+        compute_unit_limit: int = 100_000,
+    ) -> Signature:
+        latest_blockhash = await self.fetch_latest_blockhash()
+        raw_tx = self.build_transaction(ix, latest_blockhash, compute_unit_price, compute_unit_limit)
+        return await self.send_raw_transaction(raw_tx)
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+from solders.hash import Hash
+from solders.instruction import Instruction
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+from solana.rpc.types import TxOpts
+
+from moonshot.curve import AbstractCurve
+from moonshot.instrumentation import Instrumentation, DEFAULT_INSTRUMENTATION
+from moonshot.keypair import load_keypair
+from moonshot.token_launchpad import TokenLaunchpad, DEFAULT_TX_OPTIONS
+from moonshot.types import is_variant, CurveAccount, TradeType, FixedSide
+
+if TYPE_CHECKING:
+    from anchorpy import Program, Wallet
+    from solana.rpc.async_api import AsyncClient
+
+
+@dataclass
+class Order:
+    token_mint: Pubkey
+    amount: int
+    trade_type: TradeType
+    fixed_side: Optional[FixedSide] = None
+    slippage_bps: int = 100
+    compute_unit_price: int = 20_000
+    compute_unit_limit: int = 100_000
+
+
+@dataclass
+class WalletSlot:
+    index: int
+    wallet: Wallet
+    in_flight: int = 0
+    launchpads: Dict[Pubkey, TokenLaunchpad] = field(default_factory=dict)
+
+
+class RoutingPolicy(ABC):
+    @abstractmethod
+    def select(self, slots: Sequence[WalletSlot], token_mint: Pubkey) -> WalletSlot:
+        pass
+
+
+class RoundRobin(RoutingPolicy):
+    def __init__(self):
+        self.counter = itertools.count()
+
+    def select(self, slots: Sequence[WalletSlot], token_mint: Pubkey) -> WalletSlot:
+        return slots[next(self.counter) % len(slots)]
+
+
+class LeastInFlight(RoutingPolicy):
+    def select(self, slots: Sequence[WalletSlot], token_mint: Pubkey) -> WalletSlot:
+        return min(slots, key=lambda slot: (slot.in_flight, slot.index))
+
+
+class MintAffinity(RoutingPolicy):
+    # every order for a mint goes to the same wallet, so each mint's position
+    # is held in a single token account; sends are still concurrent
+    def select(self, slots: Sequence[WalletSlot], token_mint: Pubkey) -> WalletSlot:
+        return slots[int.from_bytes(bytes(token_mint)[:8], "little") % len(slots)]
+
+
+class WalletPool:
+    def __init__(
+        self,
+        connection: AsyncClient,
+        keypairs: Iterable[Union[Keypair, str]],
+        policy: Optional[RoutingPolicy] = None,
+        opts: TxOpts = DEFAULT_TX_OPTIONS,
+        max_workers: Optional[int] = None,
+        blockhash_ttl: float = 10.0,
+        curve_account_ttl: float = 0.4,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        from anchorpy import Wallet
+
+        self.connection = connection
+        self.opts = opts
+        self.policy = policy if policy is not None else RoundRobin()
+        self.instrumentation = instrumentation if instrumentation is not None else DEFAULT_INSTRUMENTATION
+        self.slots = [
+            WalletSlot(index, Wallet(keypair if isinstance(keypair, Keypair) else load_keypair(keypair)))
+            for index, keypair in enumerate(keypairs)
+        ]
+        if not self.slots:
+            raise ValueError("WalletPool needs at least one keypair")
+
+        # signing is CPU bound, so it runs in a thread pool instead of on the event loop
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="moonshot-sign")
+
+        # caches shared by every wallet: the anchorpy program (IDL and coder),
+        # the latest blockhash and per-mint curve accounts
+        self.program: Optional[Program] = None
+        self.blockhash_ttl = blockhash_ttl
+        self.curve_account_ttl = curve_account_ttl
+        self._blockhash: Optional[Tuple[Hash, float]] = None
+        self._blockhash_lock = asyncio.Lock()
+        self.curves: Dict[Pubkey, AbstractCurve] = {}
+        self._curve_accounts: Dict[Pubkey, Tuple[CurveAccount, float]] = {}
+        self._curve_account_locks: Dict[Pubkey, asyncio.Lock] = {}
+        # transactions built under the current blockhash, see unique_compute_unit_price
+        self._built_blockhash: Optional[Hash] = None
+        self._built: Set[Tuple[int, bytes, int, int]] = set()
+
+    def get_launchpad(self, slot: WalletSlot, token_mint: Pubkey) -> TokenLaunchpad:
+        launchpad = slot.launchpads.get(token_mint)
+        if launchpad is None:
+            # the first launchpad builds the program, every later one reuses it
+            launchpad = TokenLaunchpad(
+                self.connection,
+                slot.wallet,
+                token_mint,
+                self.opts,
+                program=self.program,
+                instrumentation=self.instrumentation,
+            )
+            self.program = launchpad.program
+            slot.launchpads[token_mint] = launchpad
+        if token_mint in self.curves:
+            launchpad.curve = self.curves[token_mint]
+        return launchpad
+
+    async def get_latest_blockhash(self, launchpad: TokenLaunchpad) -> Hash:
+        async with self._blockhash_lock:
+            if self._blockhash is None or monotonic() - self._blockhash[1] > self.blockhash_ttl:
+                self._blockhash = (await launchpad.fetch_latest_blockhash(), monotonic())
+            return self._blockhash[0]
+
+    async def get_curve_account(self, token_mint: Pubkey) -> CurveAccount:
+        lock = self._curve_account_locks.setdefault(token_mint, asyncio.Lock())
+        async with lock:
+            cached = self._curve_accounts.get(token_mint)
+            if cached is not None and monotonic() - cached[1] <= self.curve_account_ttl:
+                return cached[0]
+            launchpad = self.get_launchpad(self.slots[0], token_mint)
+            curve_account = await launchpad.get_curve_account()
+            self._curve_accounts[token_mint] = (curve_account, monotonic())
+            if token_mint not in self.curves:
+                self.curves[token_mint] = launchpad.get_curve(curve_account)
+            return curve_account
+
+    def route(self, token_mint: Pubkey) -> WalletSlot:
+        slot = self.policy.select(self.slots, token_mint)
+        slot.in_flight += 1
+        return slot
+
+    async def get_order_ix(self, order: Order, slot: WalletSlot) -> Instruction:
+        curve_account = await self.get_curve_account(order.token_mint)
+        launchpad = self.get_launchpad(slot, order.token_mint)
+        if is_variant(order.trade_type, "Buy"):
+            return await launchpad.get_buy_ix(order.amount, order.fixed_side, order.slippage_bps, curve_account)
+        else:
+            return await launchpad.get_sell_ix(order.amount, order.fixed_side, order.slippage_bps, curve_account)
+
+    def unique_compute_unit_price(self, order: Order, slot: WalletSlot, ix: Instruction, latest_blockhash: Hash) -> int:
+        # identical orders from one wallet under one blockhash compile to
+        # byte-identical transactions, which the cluster drops as duplicates;
+        # raise the priority fee by one micro-lamport per repeat so each is unique
+        if latest_blockhash != self._built_blockhash:
+            self._built_blockhash = latest_blockhash
+            self._built = set()
+        ix_bytes = bytes(ix)
+        price = order.compute_unit_price
+        while (slot.index, ix_bytes, order.compute_unit_limit, price) in self._built:
+            price += 1
+        self._built.add((slot.index, ix_bytes, order.compute_unit_limit, price))
+        return price
+
+    async def execute_order(
+        self,
+        order: Order,
+        slot: WalletSlot,
+        latest_blockhash: Hash,
+    ) -> Signature:
+        try:
+            ix = await self.get_order_ix(order, slot)
+            launchpad = self.get_launchpad(slot, order.token_mint)
+            compute_unit_price = self.unique_compute_unit_price(order, slot, ix, latest_blockhash)
+            raw_tx = await asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                launchpad.build_transaction,
+                ix,
+                latest_blockhash,
+                compute_unit_price,
+                order.compute_unit_limit,
+            )
+            return await launchpad.send_raw_transaction(raw_tx)
+        finally:
+            slot.in_flight -= 1
+
+    async def execute(self, orders: Sequence[Order]) -> List[Union[Signature, BaseException]]:
+        # one result per order, in order: its signature, or the exception that
+        # stopped it. A failure never hides the signatures of orders already sent.
+        routed = [(order, self.route(order.token_mint)) for order in orders]
+        if not routed:
+            return []
+        try:
+            first_order, first_slot = routed[0]
+            latest_blockhash = await self.get_latest_blockhash(
+                self.get_launchpad(first_slot, first_order.token_mint)
+            )
+        except Exception as e:
+            for _, slot in routed:
+                slot.in_flight -= 1
+            return [e] * len(routed)
+
+        return await asyncio.gather(
+            *(self.execute_order(order, slot, latest_blockhash) for order, slot in routed),
+            return_exceptions=True,
+        )
+
+    async def submit(self, order: Order) -> Signature:
+        result = (await self.execute([order]))[0]
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    def close(self):
+        self.executor.shutdown(wait=True)
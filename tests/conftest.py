@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# the stub RPC server lives with the benchmarks
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
@@ -0,0 +1,19 @@
+import pytest
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+from spl.token import constants as spl_constants
+from spl.token.instructions import get_associated_token_address as spl_get_associated_token_address
+
+from moonshot.constants import TOKEN_PROGRAM_ID, ASSOCIATED_TOKEN_PROGRAM_ID, get_associated_token_address
+
+
+def test_program_ids_match_spl():
+    assert TOKEN_PROGRAM_ID == spl_constants.TOKEN_PROGRAM_ID
+    assert ASSOCIATED_TOKEN_PROGRAM_ID == spl_constants.ASSOCIATED_TOKEN_PROGRAM_ID
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_associated_token_address_matches_spl(seed):
+    owner = Keypair.from_seed(bytes([seed]) * 32).pubkey()
+    mint = Pubkey.from_string("C1SHmyVLzhWRbXCh2zGYV9n5Wmn8suVGUTt3xedL6Etb")
+    assert get_associated_token_address(owner, mint) == spl_get_associated_token_address(owner, mint)
@@ -0,0 +1,92 @@
+import pytest
+
+from moonshot.instrumentation import (
+    Histogram, HistogramInstrumentation, NoopInstrumentation,
+    bucket_index, bucket_upper_bound, SUB_BUCKETS, QUOTE, SEND,
+)
+
+
+def test_bucket_indices_are_contiguous():
+    previous = bucket_index(0)
+    for value in range(1, 1 << 16):
+        index = bucket_index(value)
+        assert index in (previous, previous + 1)
+        previous = index
+
+
+@pytest.mark.parametrize("value", [0, 1, 7, 8, 9, 15, 16, 17, 31, 32, 1000, 123_456_789, 2**40 + 12345])
+def test_bucket_upper_bound_contains_value(value):
+    index = bucket_index(value)
+    upper = bucket_upper_bound(index)
+    assert value <= upper
+    assert bucket_index(upper) == index
+    assert bucket_index(upper + 1) == index + 1
+    if value >= SUB_BUCKETS:
+        assert upper <= value * 1.125
+
+
+def test_small_values_are_exact():
+    histogram = Histogram()
+    for value in range(SUB_BUCKETS):
+        histogram.add(value)
+    assert histogram.percentile(0.5) == 3
+    assert histogram.percentile(1.0) == SUB_BUCKETS - 1
+
+
+def test_percentiles_within_bucket_precision():
+    histogram = Histogram()
+    values = list(range(100_000, 1_100_000, 1000))
+    for value in values:
+        histogram.add(value)
+    for q in (0.5, 0.9, 0.99):
+        exact = values[int(q * len(values)) - 1]
+        assert exact <= histogram.percentile(q) <= exact * 1.125
+
+
+def test_percentile_clamped_to_observed_range():
+    histogram = Histogram()
+    histogram.add(1000)
+    assert histogram.percentile(0.5) == 1000
+    assert histogram.percentile(0.99) == 1000
+
+
+def test_empty_histogram():
+    assert Histogram().to_dict() == {
+        "count": 0,
+        "total": 0,
+        "min": None,
+        "max": None,
+        "mean": None,
+        "p50": None,
+        "p90": None,
+        "p99": None,
+    }
+
+
+def test_histogram_instrumentation_snapshot():
+    instrumentation = HistogramInstrumentation()
+    with instrumentation.span(QUOTE):
+        pass
+    instrumentation.record_duration(SEND, 5000)
+    instrumentation.record_rpc("sendTransaction")
+    instrumentation.record_rpc("sendTransaction")
+    instrumentation.record_tx_bytes(300)
+
+    snapshot = instrumentation.snapshot()
+    assert set(snapshot) == {"durations_ns", "rpc_counts", "tx_bytes"}
+    assert set(snapshot["durations_ns"]) == {QUOTE, SEND}
+    assert snapshot["durations_ns"][QUOTE]["count"] == 1
+    assert snapshot["durations_ns"][SEND]["p50"] == 5000
+    assert snapshot["rpc_counts"] == {"sendTransaction": 2}
+    assert snapshot["tx_bytes"]["total"] == 300
+
+    instrumentation.reset()
+    assert instrumentation.snapshot()["durations_ns"] == {}
+
+
+def test_noop_instrumentation():
+    instrumentation = NoopInstrumentation()
+    with instrumentation.span(QUOTE):
+        pass
+    instrumentation.record_rpc("sendTransaction")
+    assert instrumentation.snapshot() == {}
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+from solana.rpc.async_api import AsyncClient
+
+from moonshot.types import TradeType
+from moonshot.wallet_pool import WalletPool, WalletSlot, Order, RoundRobin, LeastInFlight, MintAffinity
+
+from stub_rpc import StubRpcServer, encode_curve_account
+
+TOKEN_MINT = Pubkey.from_string("C1SHmyVLzhWRbXCh2zGYV9n5Wmn8suVGUTt3xedL6Etb")
+# no curve account is served for this mint, as if the curve had finalized
+FINALIZED_MINT = Pubkey.from_string("So11111111111111111111111111111111111111112")
+KEYPAIRS = [Keypair.from_seed(bytes([i + 1]) * 32) for i in range(3)]
+
+
+def make_slots(count):
+    return [WalletSlot(index, None) for index in range(count)]
+
+
+def make_order(token_mint=TOKEN_MINT):
+    return Order(token_mint, 10**8, TradeType.Buy(), slippage_bps=500)
+
+
+@pytest.fixture
+def stub():
+    with StubRpcServer() as stub:
+        yield stub
+
+
+def run_pool(stub, fn, policy=None):
+    async def main():
+        pool = WalletPool(AsyncClient(stub.url), KEYPAIRS, policy=policy)
+        launchpad = pool.get_launchpad(pool.slots[0], TOKEN_MINT)
+        stub.add_account(launchpad.curve_account_pubkey, encode_curve_account(TOKEN_MINT, curve_amount=10**18 * 3 // 4))
+        try:
+            return pool, await fn(pool)
+        finally:
+            pool.close()
+            await pool.connection.close()
+
+    return asyncio.run(main())
+
+
+def test_round_robin_cycles_through_slots():
+    slots = make_slots(3)
+    policy = RoundRobin()
+    assert [policy.select(slots, TOKEN_MINT).index for _ in range(7)] == [0, 1, 2, 0, 1, 2, 0]
+
+
+def test_least_in_flight_prefers_idle_slots():
+    slots = make_slots(3)
+    slots[0].in_flight = 2
+    slots[1].in_flight = 1
+    slots[2].in_flight = 1
+    assert LeastInFlight().select(slots, TOKEN_MINT).index == 1
+    slots[1].in_flight = 3
+    assert LeastInFlight().select(slots, TOKEN_MINT).index == 2
+
+
+def test_mint_affinity_is_stable_per_mint():
+    slots = make_slots(4)
+    policy = MintAffinity()
+    mints = [Keypair.from_seed(bytes([i]) * 32).pubkey() for i in range(32)]
+    chosen = [policy.select(slots, mint).index for mint in mints]
+    assert chosen == [policy.select(slots, mint).index for mint in mints]
+    assert len(set(chosen)) > 1
+
+
+def test_execute_returns_signatures_and_releases_slots(stub):
+    pool, results = run_pool(stub, lambda pool: pool.execute([make_order() for _ in range(3)]))
+    assert all(isinstance(result, Signature) for result in results)
+    assert stub.sent_transactions == 3
+    assert [slot.in_flight for slot in pool.slots] == [0, 0, 0]
+
+
+def test_identical_orders_produce_distinct_transactions(stub):
+    async def fn(pool):
+        results = await pool.execute([make_order() for _ in range(6)])
+        results.append(await pool.submit(make_order()))
+        return results
+
+    _, results = run_pool(stub, fn)
+    assert len(set(results)) == 7
+
+
+def test_execute_returns_failures_in_place(stub):
+    orders = [make_order(), make_order(FINALIZED_MINT), make_order()]
+    pool, results = run_pool(stub, lambda pool: pool.execute(orders), policy=LeastInFlight())
+    assert isinstance(results[0], Signature)
+    assert isinstance(results[1], ValueError)
+    assert "Curve finalized" in str(results[1])
+    assert isinstance(results[2], Signature)
+    assert stub.sent_transactions == 2
+    assert [slot.in_flight for slot in pool.slots] == [0, 0, 0]
+
+
+def test_submit_reraises_order_failure(stub):
+    with pytest.raises(ValueError, match="Curve finalized"):
+        run_pool(stub, lambda pool: pool.submit(make_order(FINALIZED_MINT)))